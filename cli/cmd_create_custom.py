@@ -0,0 +1,37 @@
+import click
+import datetime
+from datetime import timezone
+
+from cli.common import get_megaid
+
+def validate_timestamp(ctx, param, value):
+    """Validate and parse timestamp format."""
+    if not value:
+        return None
+    try:
+        dt = datetime.datetime.strptime(value, "%Y-%m-%d:%H:%M")
+        return dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise click.BadParameter('Timestamp must be in format YYYY-MM-DD:HH:MM')
+
+@click.command(name="create-custom")
+@click.option(
+    '--timestamp',
+    required=True,
+    callback=validate_timestamp,
+    help='Timestamp in format YYYY-MM-DD:HH:MM'
+)
+def create_custom(timestamp):
+    """Create a new ID using a custom timestamp."""
+    try:
+        compound_id = get_megaid().create(
+            immutable_data={"created_at": timestamp.isoformat()},
+            mutable_data={
+                "last_updated": datetime.datetime.now(timezone.utc).isoformat()
+            }
+        )
+        click.echo(f"New custom time-based ID: {compound_id}")
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+cmd = create_custom
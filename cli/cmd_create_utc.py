@@ -0,0 +1,86 @@
+import click
+import datetime
+from datetime import timezone
+
+from cli.common import get_megaid
+
+def _load_yaml(path):
+    """Load a YAML file, using the libyaml-backed loader when available."""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+        click.echo(click.style(
+            "Warning: PyYAML was built without libyaml; "
+            "falling back to the slower pure-Python loader.",
+            fg="yellow"
+        ), err=True)
+    try:
+        with open(path, 'r') as f:
+            return yaml.load(f, Loader=Loader)
+    except yaml.YAMLError as e:
+        raise click.ClickException(f"Error parsing YAML file: {str(e)}")
+
+def _load_json(path):
+    """Load a JSON file, using orjson when it is installed."""
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except ValueError as e:
+        raise click.ClickException(f"Error parsing JSON file: {str(e)}")
+
+@click.command(name="create-utc")
+@click.argument(
+    'data_file',
+    type=click.Path(exists=True, dir_okay=False),
+    required=False
+)
+@click.option(
+    '--json', 'as_json',
+    is_flag=True,
+    help='Read the data file as JSON instead of YAML (faster with orjson)'
+)
+def create_utc(data_file, as_json):
+    """Create a new ID using current UTC time and optional YAML/JSON data.
+
+    The data file is YAML by default; pass --json to read the same
+    immutable_data/mutable_data layout from a JSON file.
+    """
+    try:
+        now = datetime.datetime.now(timezone.utc)
+        
+        # Default data
+        immutable_data = {"created_at": now.isoformat()}
+        mutable_data = {"last_updated": now.isoformat()}
+        
+        # If a data file is provided, load and merge data
+        if data_file:
+            if as_json:
+                file_data = _load_json(data_file)
+            else:
+                file_data = _load_yaml(data_file)
+
+            if not isinstance(file_data, dict):
+                file_type = "JSON" if as_json else "YAML"
+                raise click.ClickException(f"{file_type} file must contain a dictionary")
+
+            # Update with file data if provided, keeping defaults if not
+            if 'immutable_data' in file_data:
+                immutable_data.update(file_data['immutable_data'])
+            if 'mutable_data' in file_data:
+                mutable_data.update(file_data['mutable_data'])
+        
+        compound_id = get_megaid().create(
+            immutable_data=immutable_data,
+            mutable_data=mutable_data
+        )
+        click.echo(f"New UTC-based ID: {compound_id}")
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+cmd = create_utc
@@ -0,0 +1,93 @@
+import click
+import datetime
+import json
+from datetime import timezone
+
+from cli.common import get_megaid
+
+@click.command(name="decode")
+@click.argument('id_to_decode')
+def decode(id_to_decode):
+    """Decode and display metadata from a MEGAID.
+    
+    Accepts either a full compound ID or just a snowflake ID.
+    Format: snowflake:immutable:mutable or just snowflake
+    """
+    try:
+        if ':' not in id_to_decode:
+            # This is just a snowflake ID
+            try:
+                snowflake_int = int(id_to_decode)
+            except ValueError:
+                raise click.ClickException(
+                    "Invalid snowflake ID format. Must be a number."
+                )
+            # Extract timestamp from snowflake using MEGAID's decode method
+            try:
+                timestamp_ms, random_bits = get_megaid()._decode_megaid(snowflake_int)
+            except (ValueError, OverflowError) as e:
+                raise click.ClickException(f"Invalid snowflake ID: {e}")
+            timestamp = datetime.datetime.fromtimestamp(
+                timestamp_ms / 1000,
+                tz=timezone.utc
+            )
+
+            click.echo("\nSnowflake ID Analysis:")
+            click.echo("--------------------")
+            click.echo(click.style("Snowflake ID:", fg="green"))
+            click.echo(click.style(str(snowflake_int), fg="white"))
+
+            click.echo(click.style("\nTimestamp:", fg="blue"))
+            click.echo(click.style(timestamp.isoformat(), fg="white"))
+
+            click.echo(click.style("\nRandom Bits:", fg="yellow"))
+            click.echo(click.style(str(random_bits), fg="white"))
+            return
+
+        # This is a full compound ID
+        try:
+            data = get_megaid().read(id_to_decode)
+            
+            # Check if we got valid data back
+            if not data:
+                raise click.ClickException("Failed to decode MEGAID")
+            
+            # Display the data
+            click.echo("\nDecoded Compound ID Data:")
+            click.echo("----------------------")
+            click.echo(click.style("\nMEGAID:", fg="cyan"))
+            click.echo(click.style(str(data['megaid']), fg="white"))
+            
+            # Convert timestamps to readable format
+            created_date = datetime.datetime.fromtimestamp(
+                data['date_created'] / 1000,
+                tz=timezone.utc
+            )
+            updated_date = datetime.datetime.fromtimestamp(
+                data['date_updated'] / 1000,
+                tz=timezone.utc
+            )
+            
+            click.echo(click.style("\nCreated At:", fg="blue"))
+            click.echo(click.style(created_date.isoformat(), fg="white"))
+            click.echo(click.style("\nLast Updated:", fg="yellow"))
+            click.echo(click.style(updated_date.isoformat(), fg="white"))
+            
+            click.echo(click.style("\nRandom Bits:", fg="magenta"))
+            click.echo(click.style(str(data['random_bits']), fg="white"))
+            
+            click.echo(click.style("\nImmutable Data:", fg="green"))
+            immutable_json = json.dumps(data['immutable_data'], indent=2)
+            click.echo(click.style(immutable_json, fg="white"))
+            click.echo(click.style("\nMutable Data:", fg="yellow"))
+            mutable_json = json.dumps(data['mutable_data'], indent=2)
+            click.echo(click.style(mutable_json, fg="white"))
+        except Exception as e:
+            raise click.ClickException(f"Error decoding compound ID: {str(e)}")
+            
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(f"Error: {str(e)}")
+
+cmd = decode
@@ -0,0 +1,17 @@
+import click
+import sys
+
+_megaid = None
+
+def get_megaid():
+    """Return the shared MEGAID instance, creating it on first use."""
+    global _megaid
+    if _megaid is None:
+        from megaid import MEGAID
+        try:
+            _megaid = MEGAID()  # Will load from environment or generate new keys
+        except Exception as e:
+            click.echo(click.style("Error initializing MEGAID:", fg="red"))
+            click.echo(click.style(str(e), fg="red"))
+            sys.exit(1)
+    return _megaid
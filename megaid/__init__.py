@@ -1 +1,10 @@
-from .megaid import MEGAID
+def __getattr__(name):
+    # Defer importing the implementation (and with it dotenv) until one of
+    # its names is actually dereferenced.
+    if name in __all__:
+        from . import megaid
+        return getattr(megaid, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["MEGAID", "fast_iso_utc"]
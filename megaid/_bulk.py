@@ -0,0 +1,50 @@
+"""Bulk snowflake decoding for MEGAID.
+
+Requires NumPy. When Numba is installed (pip install megaid[fast]) the
+decode loop is JIT-compiled and runs in parallel; otherwise it falls back
+to vectorized NumPy bit operations.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _decode_many_numpy(mids, shift, mask):
+    return mids >> np.uint64(shift), mids & np.uint64(mask)
+
+
+if njit is not None:
+    @njit("Tuple((uint64[:], uint64[:]))(uint64[:], uint32, uint64)", parallel=True)
+    def _decode_many(mids, shift, mask):
+        ts = np.empty_like(mids)
+        rb = np.empty_like(mids)
+        for i in prange(mids.shape[0]):
+            ts[i] = mids[i] >> shift
+            rb[i] = mids[i] & mask
+        return ts, rb
+else:
+    _decode_many = _decode_many_numpy
+
+
+def _as_uint64(ids):
+    """Convert ids to a uint64 array, rejecting values a cast would wrap."""
+    arr = np.asarray(ids)
+    kind = arr.dtype.kind
+    if arr.size and kind != "u":
+        if kind == "i":
+            bad = arr.min() < 0
+        elif kind == "O":
+            bad = min(arr.flat) < 0 or max(arr.flat) >= 1 << 64
+        else:
+            raise TypeError("Snowflake IDs must be integers")
+        if bad:
+            raise OverflowError("Snowflake IDs must be between 0 and 2**64 - 1")
+    return np.ascontiguousarray(arr, dtype=np.uint64)
+
+
+def decode_many(ids, shift: int, mask: int):
+    """Split an array of snowflake IDs into timestamp and random-bit arrays."""
+    return _decode_many(_as_uint64(ids), shift, mask)
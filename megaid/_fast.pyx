@@ -0,0 +1,18 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled snowflake helpers for MEGAID.
+
+Optional: built by setup.py when Cython is available. megaid.megaid falls
+back to equivalent pure-Python functions when this extension is missing.
+"""
+import time
+
+
+cpdef unsigned long long _create_snowflake(unsigned int shift, unsigned long long rand_bits):
+    """Create a snowflake ID from the current time and the given random bits."""
+    cdef unsigned long long timestamp = time.time_ns() // 1000000
+    return (timestamp << shift) | rand_bits
+
+
+cpdef tuple _decode_snowflake(unsigned long long megaid, unsigned int shift, unsigned long long mask):
+    """Split a snowflake ID into its timestamp and random bits."""
+    return megaid >> shift, megaid & mask
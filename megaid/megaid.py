@@ -1,13 +1,98 @@
 #!/usr/bin/env python3
 import time
 import json
-import jwt  # PyJWT library
-import random
+import secrets
+import struct
 import base64
+import binascii
+import hashlib
+import hmac
 import os
+import threading
+import warnings
 from pathlib import Path
+from typing import List, Union
 from dotenv import load_dotenv
 
+# HS256 relies on hashlib/hmac being backed by OpenSSL, whose SHA-256 uses
+# SHA-NI / ARMv8 crypto instructions where the CPU provides them.
+try:
+    from _hashlib import openssl_sha256 as _openssl_sha256
+except ImportError:
+    _openssl_sha256 = None
+if hashlib.sha256 is not _openssl_sha256:
+    warnings.warn(
+        "hashlib.sha256 is not backed by OpenSSL; MEGAID token signing "
+        "will not use hardware SHA-256 acceleration",
+        RuntimeWarning
+    )
+
+try:
+    from ._fast import _create_snowflake, _decode_snowflake
+except ImportError:  # compiled extension not built; use pure-Python versions
+    def _create_snowflake(shift: int, rand_bits: int) -> int:
+        return ((time.time_ns() // 1_000_000) << shift) | rand_bits
+
+    def _decode_snowflake(megaid: int, shift: int, mask: int):
+        # Match the extension, which only accepts unsigned 64-bit IDs.
+        if not 0 <= megaid < 1 << 64:
+            raise OverflowError("Snowflake ID must be between 0 and 2**64 - 1")
+        return megaid >> shift, megaid & mask
+
+def _distinct_bits(k: int, mask: int) -> list:
+    """Return k distinct random values in [0, mask] from buffered os.urandom."""
+    span = mask + 1
+    if 2 * k > span:
+        # Dense case: draw the values to leave out instead.
+        excluded = set(_distinct_bits(span - k, mask))
+        return [r for r in range(span) if r not in excluded]
+    seen = set()
+    out = []
+    while len(out) < k:
+        # Over-draw a little so one os.urandom call usually suffices.
+        need = k - len(out)
+        count = need + need // 4 + 8
+        for r in struct.unpack(f"<{count}Q", os.urandom(8 * count)):
+            r &= mask
+            if r not in seen:
+                seen.add(r)
+                out.append(r)
+                if len(out) == k:
+                    break
+    return out
+
+_B64_TRANS = bytes.maketrans(b"+/", b"-_")
+_B64_INV_TRANS = bytes.maketrans(b"-_", b"+/")
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode bytes without padding (JWT segment encoding)."""
+    return binascii.b2a_base64(data, newline=False).translate(_B64_TRANS).rstrip(b"=")
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment.
+
+    The decoder is lenient (it skips characters outside the alphabet), so
+    only use it on segments already authenticated by the HMAC: _verify
+    signs the payload segment bytes as received and compares signatures
+    in their canonical encoding, so altered payload bytes never get here.
+    """
+    return binascii.a2b_base64(data.translate(_B64_INV_TRANS) + b"==")
+
+def fast_iso_utc(now_ns: int = None) -> str:
+    """Format a nanosecond Unix timestamp as an ISO 8601 UTC string.
+
+    Recommended for stamping created_at/last_updated metadata in hot loops,
+    e.g. fast_iso_utc() -> '2025-09-26T12:34:56.123456Z'. Defaults to now.
+    """
+    if now_ns is None:
+        now_ns = time.time_ns()
+    s, ns = divmod(now_ns, 1_000_000_000)
+    tm = time.gmtime(s)
+    return "%04d-%02d-%02dT%02d:%02d:%02d.%06dZ" % (
+        tm.tm_year, tm.tm_mon, tm.tm_mday,
+        tm.tm_hour, tm.tm_min, tm.tm_sec, ns // 1000
+    )
+
 class MEGAID:
     """
     MEGAID: Immutable + Mutable Compound ID Generator (Snowflake + Dual JWT)
@@ -24,7 +109,8 @@ class MEGAID:
         self, 
         keys: dict = None, 
         bit_size: int = 64, 
-        default_metadata: dict = None
+        default_metadata: dict = None,
+        coarsen_time: bool = False
     ):
         """Initialize MEGAID with keys from dict or environment."""
         # If no keys provided, try to load from environment
@@ -38,10 +124,78 @@ class MEGAID:
         self.admin_key = keys["ADMIN"]
         self.shared_key = keys["SHARED"]
         self.bit_size = bit_size
+        # Number of random bits below the millisecond timestamp
+        self._shift = {64: 22, 52: 10, 32: 2}[bit_size]
+        self._mask = (1 << self._shift) - 1
+
+        self.coarsen_time = coarsen_time
         self.default_metadata = default_metadata or {
             "created_by": "MEGAID",
             "version": "2.0"
         }
+        self._jwt_header_b64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+        self._init_runtime_state()
+
+    # Attributes rebuilt by _init_runtime_state rather than pickled: locks and
+    # HMAC objects cannot be pickled, and entropy must not be shared.
+    _RUNTIME_STATE = (
+        "_rand_buf", "_rand_off", "_rand_lock",
+        "_last_ts", "_ts_count", "_ts_lock",
+        "_create_megaid", "_decode_megaid",
+        "_admin_hmac", "_shared_hmac",
+    )
+
+    def _init_runtime_state(self):
+        """Set up per-process state derived from the configuration."""
+        # Entropy is pulled from os.urandom in 4 KiB blocks and consumed
+        # 8 bytes per ID; the lock keeps a shared instance thread-safe.
+        self._rand_buf = b""
+        self._rand_off = 0
+        self._rand_lock = threading.Lock()
+
+        # With coarsen_time, the clock is read once per _mask + 1
+        # (2**random_bits) IDs and that millisecond is shared between them.
+        self._last_ts = 0
+        self._ts_count = self._mask
+        self._ts_lock = threading.Lock()
+
+        # Bind the snowflake helpers specialized for this bit size once,
+        # so the hot path never branches on configuration.
+        if self.coarsen_time:
+            self._create_megaid = self._create_megaid_coarse
+        else:
+            self._create_megaid = getattr(self, f"_create_megaid_{self.bit_size}")
+        self._decode_megaid = getattr(self, f"_decode_megaid_{self.bit_size}")
+
+        # HS256 signing state prepared once: the HMAC key schedule for each
+        # key is reused for every token.
+        self._admin_hmac = hmac.new(self.admin_key.encode(), digestmod=hashlib.sha256)
+        self._shared_hmac = hmac.new(self.shared_key.encode(), digestmod=hashlib.sha256)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._RUNTIME_STATE:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_runtime_state()
+
+    @property
+    def default_metadata(self) -> dict:
+        """Metadata used when no immutable_data is given.
+
+        Returns a copy; assign a new dict to change the defaults.
+        """
+        return json.loads(self._default_metadata_json)
+
+    @default_metadata.setter
+    def default_metadata(self, metadata: dict):
+        # Snapshot the metadata as the exact bytes create() splices into
+        # the signed payload, so later edits to the caller's (possibly
+        # nested) dict have no effect.
+        self._default_metadata_json = self._encode_payload(metadata)
 
     @classmethod
     def load_or_generate_keys(cls, env_file: str = None) -> dict:
@@ -91,7 +245,7 @@ class MEGAID:
         """Generate new encryption keys."""
         def secure_random_key():
             return base64.urlsafe_b64encode(
-                random.randbytes(32)
+                secrets.token_bytes(32)
             ).decode('utf-8')
 
         if admin_key:
@@ -110,55 +264,114 @@ class MEGAID:
             "SHARED": shared_secret
         }
 
-    def create(self, immutable_data: dict = None, mutable_data: dict = None) -> str:
-        """Create a new compound ID with optional metadata."""
+    def create(
+        self,
+        immutable_data: dict = None,
+        mutable_data: dict = None,
+        as_bytes: bool = False
+    ) -> Union[str, bytes]:
+        """Create a new compound ID with optional metadata.
+
+        With as_bytes=True the ID is returned as ASCII bytes, skipping the
+        final bytes-to-str conversion for high-throughput callers.
+        """
         megaid = self._create_megaid()
         timestamp, random_bits = self._decode_megaid(megaid)
-
-        idata_payload = {
-            "megaid": megaid,
-            "date_created": timestamp,
-            "random_bits": random_bits,
-            "immutable_data": immutable_data or self.default_metadata
-        }
-        immutable_jwt = jwt.encode(
-            idata_payload,
-            self.admin_key,
-            algorithm="HS256"
+        compound_id = self._assemble(
+            megaid, timestamp, random_bits, immutable_data, mutable_data
         )
+        return compound_id if as_bytes else compound_id.decode("ascii")
 
-        mutable_payload = {
-            "date_updated": timestamp,
-            "mutable_data": (mutable_data or {})
-        }
-        mutable_jwt = jwt.encode(
-            mutable_payload,
-            self.shared_key,
-            algorithm="HS256"
-        )
+    def create_many(
+        self,
+        n: int,
+        immutable_datas: list = None,
+        mutable_datas: list = None,
+        as_bytes: bool = False
+    ) -> Union[List[str], List[bytes]]:
+        """Create n compound IDs in one call.
+
+        immutable_datas and mutable_datas, if given, hold the metadata for
+        each ID in order and must have length n. IDs share a timestamp in
+        groups of up to 2**random_bits, with random bits drawn without
+        replacement, so a batch never contains duplicate IDs. Each further
+        group waits for the next millisecond. as_bytes behaves as in create().
+        """
+        if n <= 0:
+            return []
+        immutable_datas = immutable_datas or [None] * n
+        mutable_datas = mutable_datas or [None] * n
+        if len(immutable_datas) != n or len(mutable_datas) != n:
+            raise ValueError("Metadata lists must have exactly n entries")
+
+        shift = self._shift
+        mask = self._mask
+        assemble = self._assemble
+        metadata = zip(immutable_datas, mutable_datas)
 
-        return f"{megaid}:{immutable_jwt}:{mutable_jwt}"
+        ids = []
+        timestamp = -1
+        remaining = n
+        while remaining:
+            timestamp = self._next_millisecond(timestamp)
+            base = timestamp << shift
+            k = min(remaining, mask + 1)
+            # Every ID in this group without mutable_data carries the same
+            # mutable token, so sign it once.
+            empty_mutable_jwt = None
+            for r, (idata, mdata) in zip(_distinct_bits(k, mask), metadata):
+                if mdata:
+                    ids.append(assemble(base | r, timestamp, r, idata, mdata))
+                    continue
+                if empty_mutable_jwt is None:
+                    empty_mutable_jwt = self._sign_mutable(timestamp, {})
+                ids.append(assemble(
+                    base | r, timestamp, r, idata, None, empty_mutable_jwt
+                ))
+            remaining -= k
+        return ids if as_bytes else [i.decode("ascii") for i in ids]
 
-    def read(self, compound_id: str) -> dict:
-        """Read data from a compound ID."""
+    @staticmethod
+    def _next_millisecond(previous: int) -> int:
+        """Return the current millisecond, sleeping until it is past previous."""
+        timestamp = time.time_ns() // 1_000_000
+        while timestamp <= previous:
+            # Sleep to the next millisecond boundary rather than spinning;
+            # this also waits out a backward wall-clock step.
+            time.sleep(max((previous + 1) * 1_000_000 - time.time_ns(), 0) / 1e9)
+            timestamp = time.time_ns() // 1_000_000
+        return timestamp
+
+    def decode_many(self, ids):
+        """Decode an array of snowflake IDs into timestamp and random-bit arrays.
+
+        Requires NumPy; uses Numba when installed (pip install megaid[fast]).
+        Returns a (timestamps, random_bits) pair of uint64 arrays. Raises
+        OverflowError for IDs outside [0, 2**64), like the single-ID decode.
+        """
+        from ._bulk import decode_many
+        return decode_many(ids, self._shift, self._mask)
+
+    def read(self, compound_id: Union[str, bytes]) -> dict:
+        """Read data from a compound ID (str or bytes)."""
         try:
-            parts = compound_id.split(":")
-            if len(parts) != 3:
-                raise ValueError("Invalid MEGAID format")
+            if isinstance(compound_id, bytes):
+                compound_id = compound_id.decode("ascii")
 
             # Parse tokens
-            _, immutable_token, mutable_token = parts
+            head, sep1, mutable_token = compound_id.rpartition(":")
+            _, sep2, immutable_token = head.rpartition(":")
+            if not (sep1 and sep2):
+                raise ValueError("Invalid MEGAID format")
 
             # Decode tokens
-            immutable_payload = jwt.decode(
-                immutable_token, 
-                self.admin_key, 
-                algorithms=["HS256"]
+            immutable_payload = self._verify(
+                self._admin_hmac,
+                immutable_token.encode("ascii")
             )
-            mutable_payload = jwt.decode(
-                mutable_token, 
-                self.shared_key, 
-                algorithms=["HS256"]
+            mutable_payload = self._verify(
+                self._shared_hmac,
+                mutable_token.encode("ascii")
             )
 
             return {
@@ -173,68 +386,159 @@ class MEGAID:
             print(f"Error reading compound ID: {e}")
             return {}
 
-    def update(self, compound_id: str, updates: dict) -> str:
-        """Update mutable data in a compound ID."""
+    def update(self, compound_id: Union[str, bytes], updates: dict) -> Union[str, bytes]:
+        """Update mutable data in a compound ID.
+
+        Returns the updated ID as the same type it was given (str or bytes).
+        """
+        as_bytes = isinstance(compound_id, bytes)
         try:
-            parts = compound_id.split(":")
-            if len(parts) != 3:
-                raise ValueError("Invalid MEGAID format")
+            if as_bytes:
+                compound_id = compound_id.decode("ascii")
 
-            megaid = parts[0]
-            immutable_token = parts[1]
-            mutable_token = parts[2]
+            head, sep1, mutable_token = compound_id.rpartition(":")
+            megaid, sep2, immutable_token = head.rpartition(":")
+            if not (sep1 and sep2):
+                raise ValueError("Invalid MEGAID format")
 
             # Decode mutable token
-            mutable_payload = jwt.decode(
-                mutable_token, 
-                self.shared_key, 
-                algorithms=["HS256"]
+            mutable_payload = self._verify(
+                self._shared_hmac,
+                mutable_token.encode("ascii")
             )
             current_data = mutable_payload.get("mutable_data", {})
             current_data.update(updates)
 
             # Create new payload
             new_payload = {
-                "date_updated": int(time.time() * 1000),
+                "date_updated": time.time_ns() // 1_000_000,
                 "mutable_data": current_data
             }
             
             # Encode new token
-            new_mutable_jwt = jwt.encode(
-                new_payload, 
-                self.shared_key, 
-                algorithm="HS256"
+            new_mutable_jwt = self._sign(
+                self._shared_hmac,
+                self._encode_payload(new_payload)
             )
 
-            return f"{megaid}:{immutable_token}:{new_mutable_jwt}"
+            updated_id = ":".join(
+                (megaid, immutable_token, new_mutable_jwt.decode("ascii"))
+            )
+            return updated_id.encode("ascii") if as_bytes else updated_id
 
         except Exception as e:
             print(f"Error updating compound ID: {e}")
-            return ""
-
-    def _create_megaid(self) -> int:
-        """Create a new snowflake ID."""
-        timestamp = int(time.time() * 1000)
-        if self.bit_size == 64:
-            random_bits = random.getrandbits(22)
-            megaid = (timestamp << 22) | random_bits
-        elif self.bit_size == 52:
-            random_bits = random.getrandbits(10)
-            megaid = (timestamp << 10) | random_bits
-        elif self.bit_size == 32:
-            random_bits = random.getrandbits(2)
-            megaid = (timestamp << 2) | random_bits
-        return megaid
-
-    def _decode_megaid(self, megaid: int):
-        """Decode timestamp and random bits from a snowflake ID."""
-        if self.bit_size == 64:
-            timestamp = megaid >> 22
-            random_bits = megaid & ((1 << 22) - 1)
-        elif self.bit_size == 52:
-            timestamp = megaid >> 10
-            random_bits = megaid & ((1 << 10) - 1)
-        elif self.bit_size == 32:
-            timestamp = megaid >> 2
-            random_bits = megaid & ((1 << 2) - 1)
-        return timestamp, random_bits
\ No newline at end of file
+            return b"" if as_bytes else ""
+
+    def _assemble(
+        self,
+        megaid: int,
+        timestamp: int,
+        random_bits: int,
+        immutable_data: dict,
+        mutable_data: dict,
+        mutable_jwt: bytes = None
+    ) -> bytes:
+        """Sign both payloads and join them into a compound ID.
+
+        A pre-signed mutable_jwt, if given, is used instead of signing
+        mutable_data.
+        """
+        # Payloads are spliced from bytes; the result is exactly what
+        # _encode_payload would produce for the equivalent dict.
+        if immutable_data:
+            idata_json = self._encode_payload(immutable_data)
+        else:
+            idata_json = self._default_metadata_json
+        idata_bytes = (
+            b'{"megaid":%d,"date_created":%d,"random_bits":%d,"immutable_data":' %
+            (megaid, timestamp, random_bits) + idata_json + b'}'
+        )
+        immutable_jwt = self._sign(self._admin_hmac, idata_bytes)
+
+        if mutable_jwt is None:
+            mutable_jwt = self._sign_mutable(timestamp, mutable_data or {})
+
+        return b":".join((b"%d" % megaid, immutable_jwt, mutable_jwt))
+
+    def _sign_mutable(self, timestamp: int, mutable_data: dict) -> bytes:
+        """Sign a mutable-data token with the SHARED key."""
+        return self._sign(
+            self._shared_hmac,
+            b'{"date_updated":%d,"mutable_data":' % timestamp +
+            self._encode_payload(mutable_data) + b'}'
+        )
+
+    @staticmethod
+    def _encode_payload(payload: dict) -> bytes:
+        """Serialize a JWT payload to compact, strictly valid JSON bytes."""
+        return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+
+    def _sign(self, hmac_proto, payload_bytes: bytes) -> bytes:
+        """Build an HS256 JWT from a prepared HMAC object and payload bytes."""
+        h = hmac_proto.copy()
+        signing_input = self._jwt_header_b64 + b"." + _b64url(payload_bytes)
+        h.update(signing_input)
+        sig = _b64url(h.digest())
+        return signing_input + b"." + sig
+
+    def _verify(self, hmac_proto, token_bytes: bytes) -> dict:
+        """Check an HS256 JWT signature and return its decoded payload.
+
+        The header is not parsed: the algorithm is fixed by the HMAC object
+        the token is checked against.
+        """
+        header_b64, payload_b64, sig_b64 = token_bytes.rsplit(b".", 2)
+        h = hmac_proto.copy()
+        h.update(header_b64 + b"." + payload_b64)
+        # Compare the canonical encodings so any non-canonical signature
+        # segment (junk characters, padding, whitespace) is rejected.
+        if not hmac.compare_digest(_b64url(h.digest()), sig_b64):
+            raise ValueError("Signature verification failed")
+        return json.loads(_b64url_decode(payload_b64))
+
+    def _create_megaid_64(self) -> int:
+        """Create a new 64-bit snowflake ID (22 random bits)."""
+        return _create_snowflake(22, self._draw_bits())
+
+    def _create_megaid_52(self) -> int:
+        """Create a new 52-bit snowflake ID (10 random bits)."""
+        return _create_snowflake(10, self._draw_bits())
+
+    def _create_megaid_32(self) -> int:
+        """Create a new 32-bit snowflake ID (2 random bits)."""
+        return _create_snowflake(2, self._draw_bits())
+
+    def _create_megaid_coarse(self) -> int:
+        """Create a new snowflake ID, reusing a recent timestamp."""
+        with self._ts_lock:
+            if self._ts_count < self._mask:
+                self._ts_count += 1
+            else:
+                self._last_ts = time.time_ns() // 1_000_000
+                self._ts_count = 0
+            timestamp = self._last_ts
+        return (timestamp << self._shift) | self._draw_bits()
+
+    def _draw_bits(self) -> int:
+        """Return random bits for a snowflake ID from the entropy buffer."""
+        with self._rand_lock:
+            off = self._rand_off
+            if off + 8 > len(self._rand_buf):
+                self._rand_buf = os.urandom(4096)
+                off = 0
+            self._rand_off = off + 8
+            chunk = self._rand_buf[off:off + 8]
+        return int.from_bytes(chunk, "little") & self._mask
+
+    def _decode_megaid_64(self, megaid: int):
+        """Decode timestamp and random bits from a 64-bit snowflake ID."""
+        return _decode_snowflake(megaid, 22, 0x3FFFFF)
+
+    def _decode_megaid_52(self, megaid: int):
+        """Decode timestamp and random bits from a 52-bit snowflake ID."""
+        return _decode_snowflake(megaid, 10, 0x3FF)
+
+    def _decode_megaid_32(self, megaid: int):
+        """Decode timestamp and random bits from a 32-bit snowflake ID."""
+        return _decode_snowflake(megaid, 2, 0x3)
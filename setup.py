@@ -1,5 +1,16 @@
 from setuptools import setup, find_packages
 
+# The compiled snowflake helpers are optional: without Cython, or if the C
+# compiler fails, the package installs as pure Python.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(["megaid/_fast.pyx"], language_level=3)
+    for ext in ext_modules:
+        ext.optional = True
+
 setup(
     name='megaid',
     version='1.0.0',
@@ -9,10 +20,14 @@ setup(
     author='MEGALab',
     author_email='shawn@megalab.io',
     url='https://github.com/MEGALab/MEGAID-python',
-    packages=find_packages(),
+    packages=find_packages(exclude=("cli", "cli.*", "tests", "tests.*")),
+    ext_modules=ext_modules,
     install_requires=[
-        'PyJWT>=2.8.0'
+        'python-dotenv'
     ],
+    extras_require={
+        'fast': ['orjson', 'numpy', 'numba'],
+    },
     classifiers=[
         'License :: OSI Approved :: GNU Affero General Public License v3',
         'Programming Language :: Python :: 3',
@@ -0,0 +1,69 @@
+import click
+import pytest
+from click.testing import CliRunner
+
+from cli import common
+from cli.main import COMMANDS, cli
+from megaid import MEGAID
+
+@pytest.fixture
+def gen(monkeypatch):
+    """MEGAID matching the keys the CLI will load from the environment."""
+    keys = MEGAID.generate_encryption_keys()
+    monkeypatch.setenv("MEGAID_ADMIN_KEY", keys["ADMIN"])
+    monkeypatch.setenv("MEGAID_SHARED_KEY", keys["SHARED"])
+    monkeypatch.setattr(common, "_megaid", None)
+    return MEGAID(keys)
+
+def _create_utc(tmp_path, args, filename, content):
+    data_file = tmp_path / filename
+    data_file.write_text(content)
+    return CliRunner().invoke(cli, ["create-utc", *args, str(data_file)])
+
+def test_help_lists_every_command():
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name in COMMANDS:
+        assert name in result.output
+
+def test_command_table_matches_docstrings():
+    ctx = click.Context(cli)
+    for name, help_text in COMMANDS.items():
+        cmd = cli.get_command(ctx, name)
+        assert cmd is not None
+        assert help_text == cmd.get_short_help_str(limit=1000)
+
+def test_create_utc_yaml(gen, tmp_path):
+    result = _create_utc(tmp_path, [], "data.yaml", "immutable_data:\n  product: tile\nmutable_data:\n  qty: 10\n")
+    assert result.exit_code == 0, result.output
+
+    payload = gen.read(result.output.split()[-1])
+    assert payload["immutable_data"]["product"] == "tile"
+    assert payload["mutable_data"]["qty"] == 10
+
+def test_create_utc_json(gen, tmp_path):
+    result = _create_utc(tmp_path, ["--json"], "data.json", '{"immutable_data": {"product": "tile"}, "mutable_data": {"qty": 10}}')
+    assert result.exit_code == 0, result.output
+
+    payload = gen.read(result.output.split()[-1])
+    assert payload["immutable_data"]["product"] == "tile"
+    assert payload["mutable_data"]["qty"] == 10
+
+def test_create_utc_json_must_be_a_dict(gen, tmp_path):
+    result = _create_utc(tmp_path, ["--json"], "data.json", "[1, 2]")
+    assert result.exit_code != 0
+    assert "JSON file must contain a dictionary" in result.output
+
+def test_create_utc_malformed_json(gen, tmp_path):
+    result = _create_utc(tmp_path, ["--json"], "data.json", '{"immutable_data": ')
+    assert result.exit_code != 0
+    assert "Error parsing JSON file" in result.output
+
+def test_create_utc_yaml_without_libyaml(gen, tmp_path, monkeypatch):
+    yaml = pytest.importorskip("yaml")
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+
+    result = _create_utc(tmp_path, [], "data.yaml", "immutable_data:\n  product: tile\n")
+    assert result.exit_code == 0, result.output
+    assert "without libyaml" in result.stderr
+    assert gen.read(result.stdout.split()[-1])["immutable_data"]["product"] == "tile"
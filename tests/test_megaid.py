@@ -2,17 +2,187 @@ import pytest
 from megaid import MEGAID
 
 def test_basic_create_read_update():
-    secret = MEGAID.generate_encryption_key()
-    gen = MEGAID(secret_key=secret, bit_size=52)
+    keys = MEGAID.generate_encryption_keys()
+    gen = MEGAID(keys, bit_size=52)
 
     compound_id = gen.create({"testkey": "testvalue"})
     assert compound_id
 
     payload = gen.read(compound_id)
-    assert "snowflake" in payload
-    assert "data" in payload
-    assert payload["data"]["testkey"] == "testvalue"
+    assert "megaid" in payload
+    assert "immutable_data" in payload
+    assert payload["immutable_data"]["testkey"] == "testvalue"
 
     updated_id = gen.update(compound_id, {"newkey": "newvalue"})
     updated_payload = gen.read(updated_id)
-    assert updated_payload["data"]["newkey"] == "newvalue"
+    assert updated_payload["mutable_data"]["newkey"] == "newvalue"
+    assert updated_payload["immutable_data"] == payload["immutable_data"]
+
+def test_tokens_are_standard_hs256_jwts():
+    import jwt
+
+    keys = MEGAID.generate_encryption_keys()
+    gen = MEGAID(keys, bit_size=64)
+
+    _, immutable_token, mutable_token = gen.create({"a": 1}, {"b": 2}).split(":")
+    immutable_payload = jwt.decode(immutable_token, keys["ADMIN"], algorithms=["HS256"])
+    mutable_payload = jwt.decode(mutable_token, keys["SHARED"], algorithms=["HS256"])
+    assert immutable_payload["immutable_data"] == {"a": 1}
+    assert mutable_payload["mutable_data"] == {"b": 2}
+
+def test_create_many():
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=64)
+
+    ids = gen.create_many(3, mutable_datas=[{"i": 0}, {"i": 1}, {"i": 2}])
+    assert len(ids) == 3
+    for i, compound_id in enumerate(ids):
+        payload = gen.read(compound_id)
+        assert payload["immutable_data"] == gen.default_metadata
+        assert payload["mutable_data"] == {"i": i}
+    assert gen.create_many(0) == []
+
+def test_fast_iso_utc():
+    from megaid import fast_iso_utc
+
+    assert fast_iso_utc(1_758_890_096_123_456_789) == "2025-09-26T12:34:56.123456Z"
+
+def test_decode_many():
+    np = pytest.importorskip("numpy")
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=52)
+
+    ids = [gen._create_megaid() for _ in range(10)]
+    timestamps, random_bits = gen.decode_many(ids)
+    assert list(zip(timestamps.tolist(), random_bits.tolist())) == [
+        gen._decode_megaid(i) for i in ids
+    ]
+
+    for bad in (np.array([-1], dtype=np.int64), [2**64], [-1]):
+        with pytest.raises(OverflowError):
+            gen.decode_many(bad)
+
+def test_decode_many_numpy_fallback():
+    np = pytest.importorskip("numpy")
+    from megaid._bulk import _decode_many_numpy
+
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=64)
+    ids = [gen._create_megaid() for _ in range(10)]
+    timestamps, random_bits = _decode_many_numpy(
+        np.array(ids, dtype=np.uint64), gen._shift, gen._mask
+    )
+    assert list(zip(timestamps.tolist(), random_bits.tolist())) == [
+        gen._decode_megaid(i) for i in ids
+    ]
+
+def test_default_metadata_is_snapshotted():
+    metadata = {"created_by": "tests", "tags": {"a": 1}}
+    gen = MEGAID(MEGAID.generate_encryption_keys(), default_metadata=metadata)
+
+    # Edits to the caller's dict or to the returned copy never diverge
+    # from what create() signs.
+    metadata["tags"]["b"] = 2
+    gen.default_metadata["tags"]["c"] = 3
+    expected = {"created_by": "tests", "tags": {"a": 1}}
+    assert gen.default_metadata == expected
+    assert gen.read(gen.create())["immutable_data"] == expected
+    assert isinstance(gen.default_metadata, dict)
+
+    gen.default_metadata = {"created_by": "tests", "version": "3.0"}
+    payload = gen.read(gen.create())
+    assert payload["immutable_data"] == {"created_by": "tests", "version": "3.0"}
+
+def test_read_rejects_invalid_signatures():
+    gen = MEGAID(MEGAID.generate_encryption_keys())
+    other = MEGAID(MEGAID.generate_encryption_keys())
+    compound_id = gen.create({"a": 1}, {"b": 2})
+    megaid, immutable_token, mutable_token = compound_id.split(":")
+
+    # Wrong key
+    assert other.read(compound_id) == {}
+
+    # Tampered payload, original signature
+    header, _, sig = immutable_token.split(".")
+    forged_payload = gen._sign(gen._admin_hmac, b'{"a":2}').split(b".")[1].decode()
+    forged = ".".join((header, forged_payload, sig))
+    assert gen.read(":".join((megaid, forged, mutable_token))) == {}
+
+    # Junk in the signature segment
+    assert gen.read(compound_id + "!!") == {}
+    assert gen.read(compound_id[:-4] + "\n" + compound_id[-4:]) == {}
+    assert gen.read(compound_id + "==") == {}
+
+def test_payload_round_trip():
+    gen = MEGAID(MEGAID.generate_encryption_keys())
+
+    data = {"big": 2**70, "pi": 3.25, "text": "café", "nested": [1, None]}
+    assert gen.read(gen.create(data))["immutable_data"] == data
+
+    for bad in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            gen.create({"x": bad})
+
+def test_decode_rejects_out_of_range_ids():
+    gen = MEGAID(MEGAID.generate_encryption_keys())
+
+    for bad in (-1, 2**64):
+        with pytest.raises(OverflowError):
+            gen._decode_megaid(bad)
+
+def test_compiled_snowflake_helpers_match_python():
+    fast = pytest.importorskip("megaid._fast")
+
+    for megaid in (0, 1, 2**63 + 12345, 2**64 - 1):
+        assert fast._decode_snowflake(megaid, 22, 0x3FFFFF) == (
+            megaid >> 22, megaid & 0x3FFFFF
+        )
+    assert fast._create_snowflake(10, 0x3FF) & 0x3FF == 0x3FF
+
+def test_coarsen_time_reuses_timestamp(monkeypatch):
+    import megaid.megaid as megaid_module
+
+    clock = iter(range(1_000_000_000, 10**12, 1_000_000_000))
+    monkeypatch.setattr(megaid_module.time, "time_ns", lambda: next(clock))
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=32, coarsen_time=True)
+
+    timestamps = [gen._decode_megaid(gen._create_megaid())[0] for _ in range(gen._mask + 2)]
+    assert timestamps[:-1] == [1000] * (gen._mask + 1)
+    assert timestamps[-1] == 2000
+
+def test_create_many_ids_are_unique():
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=32)
+
+    ids = gen.create_many(20, mutable_datas=[{"i": i} for i in range(20)])
+    megaids = [int(compound_id.split(":")[0]) for compound_id in ids]
+    assert len(set(megaids)) == 20
+    assert [gen.read(c)["mutable_data"]["i"] for c in ids] == list(range(20))
+
+    # Spans a full 1024-ID group and a partial one at 52 bits
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=52)
+    ids = gen.create_many(1500)
+    assert len({compound_id.split(":")[0] for compound_id in ids}) == 1500
+
+def test_as_bytes_round_trip():
+    gen = MEGAID(MEGAID.generate_encryption_keys())
+
+    compound_id = gen.create({"a": 1}, {"b": 2}, as_bytes=True)
+    assert isinstance(compound_id, bytes)
+    assert gen.read(compound_id)["immutable_data"] == {"a": 1}
+
+    updated_id = gen.update(compound_id, {"c": 3})
+    assert isinstance(updated_id, bytes)
+    assert gen.read(updated_id)["mutable_data"] == {"b": 2, "c": 3}
+    assert gen.update(b"invalid", {}) == b""
+
+    batch = gen.create_many(2, as_bytes=True)
+    assert all(isinstance(i, bytes) for i in batch)
+    assert gen.read(batch[0].decode("ascii"))
+
+def test_pickle_round_trip():
+    import pickle
+
+    gen = MEGAID(MEGAID.generate_encryption_keys(), bit_size=52, coarsen_time=True)
+    compound_id = gen.create({"a": 1})
+
+    clone = pickle.loads(pickle.dumps(gen))
+    assert clone._rand_buf == b""  # buffered entropy is not copied
+    assert clone.read(compound_id)["immutable_data"] == {"a": 1}
+    assert gen.read(clone.create({"b": 2}))["immutable_data"] == {"b": 2}